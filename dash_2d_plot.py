@@ -12,49 +12,75 @@
 #              displayed on hover.
 #
 # Usage: Execute this script to generate the 2D t-SNE plot. Ensure the CSV file
-#        is in the root directory.
+#        is in the root directory. In production, serve it with preloaded gunicorn
+#        workers so the data loading runs once and is shared by every worker:
+#            gunicorn dash_2d_plot:server -w 4 --preload --worker-class gthread --threads 4 --timeout 60
 # --------------------------------------------------------------------------------
 
 import os
 import json
+import hashlib
+import functools
 import numpy as np
 import dash
-from dash import dcc, html
+from dash import dcc, html, Patch
 import plotly.graph_objs as go
 import pandas as pd
 from sklearn.manifold import TSNE
-from sklearn.metrics.pairwise import euclidean_distances
-from sklearn.preprocessing import StandardScaler
 from dash.dependencies import Input, Output, State
 
 
-csv_file_path = './src/assets/data/census_zipcode_percentages.csv'
-census_data = pd.read_csv(csv_file_path)
-enrollment_data = pd.read_csv('./src/assets/data/enrollment 2019-2023.csv')
+# bump CACHE_VERSION whenever the preprocessing/t-SNE pipeline changes
+CACHE_DIR = './.cache'
+CACHE_VERSION = 7
+
+# slider values are quantized to buckets of 1 / SLIDER_SCALE (matches the RangeSlider step of 0.1)
+SLIDER_SCALE = 10
+
+# ZIP columns are parsed as Arrow-backed strings once, when the CSV is converted
+ZIP_COLUMNS = ['Zip_Code', 'Mailing Zip/Postal Code']
 
-# Ensure both ZIP Code columns are strings for proper merging
-census_data['Zip_Code'] = census_data['Zip_Code'].astype(str).str.strip()
-enrollment_data['Mailing Zip/Postal Code'] = enrollment_data['Mailing Zip/Postal Code'].astype(str).str.strip()
 
+def _file_key(path):
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read()).hexdigest()[:16]
 
 
-# strip and stringify zip codes
-census_data['Zip_Code'] = census_data['Zip_Code'].astype(str).str.strip()
+# Convert each CSV to Feather on first use and read the Feather copy afterwards
+def _read_table(csv_path):
+    stem = os.path.splitext(os.path.basename(csv_path))[0].replace(' ', '_')
+    feather_path = os.path.join(CACHE_DIR, f"{stem}_{_file_key(csv_path)}.feather")
+    if not os.path.exists(feather_path):
+        header = pd.read_csv(csv_path, nrows=0).columns
+        df = pd.read_csv(csv_path, dtype={col: 'string[pyarrow]' for col in ZIP_COLUMNS if col in header})
+        for col in ZIP_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].str.strip()
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{feather_path}.{os.getpid()}.tmp"
+        df.to_feather(tmp_path)
+        os.replace(tmp_path, feather_path)
+    return pd.read_feather(feather_path)
+
+
+csv_file_path = './src/assets/data/census_zipcode_percentages.csv'
+census_data = _read_table(csv_file_path)
+enrollment_data = _read_table('./src/assets/data/enrollment 2019-2023.csv')
 
 # Replace NULL (NaN) values with 0 or the median avg for that column
+# (all three medians come from one reduction)
+column_medians = census_data[['Median_Income', 'Unemployment', 'Median_Home_Value']].median()
 census_data.fillna({
     'Population': 0,
-    'Median_Income': census_data['Median_Income'].median(),
     'Bachelor_Degree': 0,
     'Graduate_Professional_Degree': 0,
     'White_Alone': 0,
     'Black_Alone': 0,
     'Hispanic_Latino': 0,
-    'Unemployment': census_data['Unemployment'].median(),
-    'Median_Home_Value': census_data['Median_Home_Value'].median()
+    **column_medians.to_dict()
 }, inplace=True)
 
-cbu_zipcodes = [
+cbu_zipcodes = frozenset({
     '92503', '92504', '92508', '92506', '92880', '92571', '92336', '92509',
     '92882', '92399', '92881', '92505', '92223', '92557', '92553', '92555',
     '91709', '92879', '92584', '92883', '92507', '92374', '92562', '91752',
@@ -62,72 +88,264 @@ cbu_zipcodes = [
     '92563', '92346', '92373', '92860', '92530', '92337', '92551', '91761',
     '92404', '91737', '92532', '92544', '91762', '92308', '92545', '92392',
     '91701', '92583'
-]
+})
 
 # filter and find CBU zip codes within the dataset
-cbu_census_data = census_data[census_data['Zip_Code'].isin(cbu_zipcodes)]
+cbu_mask = census_data['Zip_Code'].isin(cbu_zipcodes)
+cbu_census_data = census_data[cbu_mask]
 
 features = ['Population', 'Median_Income', 'Bachelor_Degree', 'Graduate_Professional_Degree',
             'White_Alone', 'Black_Alone', 'Hispanic_Latino', 'Unemployment', 'Median_Home_Value']
 
-# standardize
-scaler = StandardScaler()
-cbu_census_data_scaled = scaler.fit_transform(cbu_census_data[features])
-
 # find non-CBU zip codes
-non_cbu_census_data = census_data[~census_data['Zip_Code'].astype(str).isin(cbu_zipcodes)]
-non_cbu_census_data_scaled = scaler.transform(non_cbu_census_data[features])
+non_cbu_census_data = census_data[~cbu_mask]
+
+
+# Top-k non-CBU rows closest to the CBU centroid, plus each one's closest CBU row and distance
+def _top_matches(non_cbu_scaled, cbu_scaled, k):
+    # calculate Euclidean distance between non-CBU zip codes & centroid of CBU zip codes (average position)
+    # (squared distances keep the same order, so no sqrt is needed)
+    cbu_centroid = cbu_scaled.mean(axis=0)
+    centroid_diff = non_cbu_scaled - cbu_centroid
+    centroid_squared_dist = np.einsum('ij,ij->i', centroid_diff, centroid_diff)
+
+    # partial select in O(N), then sort only those k by distance
+    top_indices = np.argpartition(centroid_squared_dist, k)[:k]
+    top_indices = top_indices[np.argsort(centroid_squared_dist[top_indices])]
+    top_scaled = non_cbu_scaled[top_indices]
+
+    # closest CBU row for each, using ||a||^2 + ||b||^2 - 2ab so the work is a single matmul
+    sq_a = np.einsum('ij,ij->i', top_scaled, top_scaled)
+    sq_b = np.einsum('ij,ij->i', cbu_scaled, cbu_scaled)
+    squared_dist = sq_a[:, None] + sq_b[None, :] - 2.0 * (top_scaled @ cbu_scaled.T)
+    closest_indices = np.argmin(squared_dist, axis=1)
+
+    # sqrt only the closest distance of each row
+    closest_squared_dist = squared_dist[np.arange(k), closest_indices]
+    closest_distances = np.sqrt(np.maximum(closest_squared_dist, 0))
+    return top_indices, closest_indices, closest_distances
+
+
+def _build_cache():
+    # standardize against the CBU rows, in float32 (plenty of precision for ranking and t-SNE, half the memory traffic)
+    features_all = census_data[features].to_numpy(dtype=np.float32)
+    is_cbu = cbu_mask.to_numpy()
+    features_cbu = features_all[is_cbu]
+    mean = features_cbu.mean(axis=0)
+    std = features_cbu.std(axis=0)
+    std[std == 0] = 1.0
+    cbu_census_data_scaled = (features_cbu - mean) / std
+    non_cbu_census_data_scaled = (features_all[~is_cbu] - mean) / std
+
+    # rank non-CBU zip codes by similarity and match each of the top 100 to its closest CBU zip code
+    top_100_indices, closest_cbu_indices, closest_distances = _top_matches(
+        non_cbu_census_data_scaled, cbu_census_data_scaled, 100)
+    top_100_non_cbu_census_data_scaled = non_cbu_census_data_scaled[top_100_indices]
+
+    # calculate similarity scores
+    similarity_scores = 1 / closest_distances
+
+    # perform t-SNE to reduce the data to 2D (PCA init and auto learning rate converge in fewer iterations)
+    tsne = TSNE(n_components=2, random_state=42, perplexity=10, learning_rate='auto', init='pca', n_jobs=-1)
+
+    # combine the data before applying t-SNE
+    combined_data_scaled = np.vstack([cbu_census_data_scaled, top_100_non_cbu_census_data_scaled])
+    combined_coords = tsne.fit_transform(combined_data_scaled)
+
+    return {
+        'top_100_indices': top_100_indices,
+        'closest_cbu_indices': closest_cbu_indices,
+        'similarity_scores': similarity_scores,
+        'combined_coords': combined_coords,
+    }
+
+
+# t-SNE dominates startup, so its results are saved to disk keyed by a hash of the census CSV
+def _load_or_build_cache(csv_path):
+    cache_path = os.path.join(CACHE_DIR, f"tsne_v{CACHE_VERSION}_{_file_key(csv_path)}.npz")
+    if os.path.exists(cache_path):
+        with np.load(cache_path) as data:
+            return {name: data[name] for name in data.files}
+
+    cached = _build_cache()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # write to a temp file first so a concurrent worker never loads a partial cache
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **cached)
+    os.replace(tmp_path, cache_path)
+    return cached
+
+
+cached = _load_or_build_cache(csv_file_path)
+top_100_indices = cached['top_100_indices']
+closest_cbu_indices = cached['closest_cbu_indices']
+similarity_scores = cached['similarity_scores']
+combined_coords = cached['combined_coords']
+
+# features offered in the filter dropdown
+filter_features = ['Population', 'Median_Income', 'Bachelor_Degree', 'Unemployment', 'Median_Home_Value']
+
+# columns the graph displays (ZIP label plus the hover/filter fields)
+display_columns = ['Zip_Code'] + filter_features
+
+# select top 100 most similar non-CBU zip codes, keeping only the displayed columns
+top_100_non_cbu_census_data = non_cbu_census_data.iloc[
+    top_100_indices, non_cbu_census_data.columns.get_indexer(display_columns)
+]
 
-# calculate Euclidean distance between non-CBU zip codes & centroid of CBU zip codes (average position)
-# distancing on the 2d-map
-cbu_centroid = np.mean(cbu_census_data_scaled, axis=0)
-distances = euclidean_distances(non_cbu_census_data_scaled, [cbu_centroid])
+# ZIP labels as plain arrays so the callback can slice them directly
+cbu_zips = cbu_census_data['Zip_Code'].to_numpy()
+top_100_non_cbu_zips = top_100_non_cbu_census_data['Zip_Code'].to_numpy()
+closest_cbu_zipcodes = cbu_zips[closest_cbu_indices]
 
-# calculate indices of the top 100 closest non-CBU zip codes
-top_100_indices = np.argsort(distances, axis=0)[:100].flatten()
 
-# select top 100 most similar non-CBU zip codes
-top_100_non_cbu_census_data = non_cbu_census_data.iloc[top_100_indices]
-top_100_non_cbu_census_data_scaled = non_cbu_census_data_scaled[top_100_indices]
+# presort each filter column once so slider filtering is two binary searches instead of a mask
+def _presort(data):
+    sorted_columns = {}
+    for feature in filter_features:
+        values = data[feature].to_numpy()
+        order = np.argsort(values, kind='stable')
+        sorted_columns[feature] = (order, values[order])
+    return sorted_columns
 
-# find closest CBU ZIP codes for each node
-euclidean_dist = euclidean_distances(top_100_non_cbu_census_data_scaled, cbu_census_data_scaled)
-closest_cbu_indices = np.argmin(euclidean_dist, axis=1)
-closest_cbu_zipcodes = cbu_census_data.iloc[closest_cbu_indices]['Zip_Code'].values
 
-# calculate similarity scores
-closest_distances = np.min(euclidean_dist, axis=1)
-similarity_scores = 1 / closest_distances
+def _rows_in_range(sorted_columns, feature, feature_range):
+    order, values = sorted_columns[feature]
+    lo_i = np.searchsorted(values, feature_range[0], side='left')
+    hi_i = np.searchsorted(values, feature_range[1], side='right')
+    # keep the original row order (non-CBU rows are ranked by similarity)
+    return np.sort(order[lo_i:hi_i])
 
-# perform t-SNE to reduce the data to 2D
-tsne = TSNE(n_components=2, random_state=42, perplexity=10, learning_rate=200, init='random')
 
-# combine the data before applying t-SNE
-combined_data_scaled = np.vstack([cbu_census_data_scaled, top_100_non_cbu_census_data_scaled])
-combined_coords = tsne.fit_transform(combined_data_scaled)
+cbu_sorted_columns = _presort(cbu_census_data)
+top_100_non_cbu_sorted_columns = _presort(top_100_non_cbu_census_data)
 
 # define coordinates for 2d graph
 cbu_coords = combined_coords[:len(cbu_census_data)]
 non_cbu_coords = combined_coords[len(cbu_census_data):]
 
 def generate_hover_info(data, closest_cbu_zipcodes=None, similarity_scores=None):
-    hover_info = []
-    for i, row in enumerate(data.iterrows()):
-        hover_text = f"ZIP: {row[1]['Zip_Code']}<br>" \
-                     f"Population: {int(row[1]['Population'])}<br>" \
-                     f"Median Income: {int(row[1]['Median_Income'])}<br>" \
-                     f"Education (Bachelors): {row[1]['Bachelor_Degree']:.1f}<br>" \
-                     f"Unemployment: {row[1]['Unemployment']:.1f}<br>" \
-                     f"Median Home Value: {int(row[1]['Median_Home_Value'])}"
-        # if closest_cbu_zipcodes is not None and similarity_scores is not None:
-        #     hover_text += f"<br>Most Similar CBU ZIP: {closest_cbu_zipcodes[i]}" \
-        #                   f"<br>Similarity Score: {similarity_scores[i]:.2f}"
-        hover_info.append(hover_text)
-    return hover_info
+    if data.empty:
+        return []
+
+    # build every hover string column-wise instead of boxing each row into a Series
+    hover_info = ("ZIP: " + data['Zip_Code'].astype(str)
+                  + "<br>Population: " + data['Population'].astype('int64').astype(str)
+                  + "<br>Median Income: " + data['Median_Income'].astype('int64').astype(str)
+                  + "<br>Education (Bachelors): " + data['Bachelor_Degree'].map('{:.1f}'.format)
+                  + "<br>Unemployment: " + data['Unemployment'].map('{:.1f}'.format)
+                  + "<br>Median Home Value: " + data['Median_Home_Value'].astype('int64').astype(str))
+    # if closest_cbu_zipcodes is not None and similarity_scores is not None:
+    #     hover_info += "<br>Most Similar CBU ZIP: " + pd.Series(closest_cbu_zipcodes[:len(data)], index=data.index) \
+    #                   + "<br>Similarity Score: " + pd.Series(similarity_scores[:len(data)], index=data.index).map('{:.2f}'.format)
+    return hover_info.tolist()
+
+
+# Hover text never changes for a given row, so it is generated once for every displayed row
+cbu_hover_info = np.array(generate_hover_info(cbu_census_data), dtype=object)
+top_100_non_cbu_hover_info = np.array(
+    generate_hover_info(top_100_non_cbu_census_data, closest_cbu_zipcodes, similarity_scores), dtype=object)
+
+
+# Axis titles and (x, y) arrays for each demographic dimension, extracted once
+DIMENSION_TITLES = {
+    'generalized': ('t-SNE Component 1', 't-SNE Component 2'),
+    'economic_prosperity': ('Median Income', 'Median Home Value'),
+    'educational_attainment': ('Percentage with Bachelor’s Degree', 'Percentage with Graduate/Professional Degree'),
+    'population_density': ('Population', 'Unemployment Rate'),
+    'ethnic_diversity': ('Percentage Hispanic or Latino', 'Percentage Black or African American'),
+}
+DIMENSION_XY = {
+    'generalized': (combined_coords[:, 0], combined_coords[:, 1]),
+    'economic_prosperity': (census_data['Median_Income'].to_numpy(), census_data['Median_Home_Value'].to_numpy()),
+    'educational_attainment': (census_data['Bachelor_Degree'].to_numpy(),
+                               census_data['Graduate_Professional_Degree'].to_numpy()),
+    'population_density': (census_data['Population'].to_numpy(), census_data['Unemployment'].to_numpy()),
+    'ethnic_diversity': (census_data['Hispanic_Latino'].to_numpy(), census_data['Black_Alone'].to_numpy()),
+}
+
+
+# The trace data only depends on the dropdowns and the quantized slider range, so results are memoized
+@functools.lru_cache(maxsize=256)
+def _build_traces(selected_dimension, selected_feature, lo_bucket, hi_bucket):
+    feature_range = (lo_bucket / SLIDER_SCALE, hi_bucket / SLIDER_SCALE)
+
+    # Axis titles and data for the selected dimension (Generalized uses the combined t-SNE components)
+    xaxis_title, yaxis_title = DIMENSION_TITLES.get(selected_dimension, DIMENSION_TITLES['generalized'])
+    x_data, y_data = DIMENSION_XY.get(selected_dimension, DIMENSION_XY['generalized'])
+
+    # Filter data based on selected feature and slider range
+    cbu_rows = _rows_in_range(cbu_sorted_columns, selected_feature, feature_range)
+    non_cbu_rows = _rows_in_range(top_100_non_cbu_sorted_columns, selected_feature, feature_range)
+
+    # Limit non-CBU nodes to 50
+    non_cbu_rows = non_cbu_rows[:50]
+
+    # Trace data for filtered rows (hover text is precomputed per row)
+    num_cbu = len(cbu_rows)
+    num_non_cbu = len(non_cbu_rows)
+    trace_cbu = dict(
+        x=x_data[:num_cbu].tolist(),
+        y=y_data[:num_cbu].tolist(),
+        text=cbu_zips[cbu_rows].tolist(),
+        hovertext=cbu_hover_info[cbu_rows].tolist()
+    )
+    trace_non_cbu = dict(
+        x=x_data[num_cbu:num_cbu + num_non_cbu].tolist(),
+        y=y_data[num_cbu:num_cbu + num_non_cbu].tolist(),
+        text=top_100_non_cbu_zips[non_cbu_rows].tolist(),
+        hovertext=top_100_non_cbu_hover_info[non_cbu_rows].tolist()
+    )
+
+    return xaxis_title, yaxis_title, (trace_cbu, trace_non_cbu)
+
+
+# Build the complete figure for the initial layout; later updates are sent as Patch objects
+def _make_figure(selected_dimension, selected_feature, lo_bucket, hi_bucket):
+    xaxis_title, yaxis_title, (cbu_trace_data, non_cbu_trace_data) = _build_traces(
+        selected_dimension, selected_feature, lo_bucket, hi_bucket)
+
+    trace_cbu = go.Scatter(
+        **cbu_trace_data,
+        mode='markers+text',
+        marker=dict(
+            size=10,
+            color='rgb(0, 213, 240)',
+            opacity=0.8
+        ),
+        hoverinfo='text',
+        name='CBU'
+    )
+
+    trace_non_cbu = go.Scatter(
+        **non_cbu_trace_data,
+        mode='markers+text',
+        marker=dict(
+            size=10,
+            color='rgb(235,216,1)',
+            opacity=0.8
+        ),
+        hoverinfo='text',
+        name='Non-CBU'
+    )
+
+    layout = go.Layout(
+        xaxis=dict(title=xaxis_title),
+        yaxis=dict(title=yaxis_title),
+        margin=dict(l=0, r=0, b=0, t=0),
+        autosize=True,
+        showlegend=True
+    )
+
+    return go.Figure(data=[trace_cbu, trace_non_cbu], layout=layout)
 
 
 app = dash.Dash(__name__)
 
+# WSGI entry point for gunicorn
+server = app.server
+
 # App layout
 app.layout = html.Div([
     html.Div([
@@ -213,12 +431,16 @@ app.layout = html.Div([
 
         # Main content (Graph)
         html.Div([
-            dcc.Graph(id='tsne-plot', style={'height': '75vh', 'width': '100%'})
+            dcc.Graph(
+                id='tsne-plot',
+                figure=_make_figure('generalized', 'Population', 0, 1000000 * SLIDER_SCALE),
+                style={'height': '75vh', 'width': '100%'}
+            )
         ], id='graph-container', style={'position': 'relative', 'paddingLeft': '10px'})
     ])
 ])
 
-city_images_df = pd.read_csv('./src/assets/data/city_images.csv')
+city_images_df = _read_table('./src/assets/data/city_images.csv')
 
 # Merge city and zipcode demographic data
 merged_data = pd.merge(
@@ -232,6 +454,12 @@ merged_data = pd.merge(
 # Filter CA zips
 california_data = merged_data[merged_data['Mailing State/Province'] == 'CA']
 
+# Index lookups used by the click callback so each click is a hash lookup instead of a column scan
+california_by_zip = california_data.set_index('Zip_Code', drop=False)
+city_pop = california_data.groupby('Mailing City', sort=False)['Population'].sum()
+city_image_urls = city_images_df.set_index(city_images_df['City'].str.lower())['Image_URL']
+city_image_urls = city_image_urls[~city_image_urls.index.duplicated()]
+
 
 @app.callback(
     Output('portfolio-section', 'children'),
@@ -243,23 +471,20 @@ def update_portfolio(click_data):
 
     # Extract ZIP code from clickData
     selected_zip = click_data['points'][0]['text']
-    filtered_data = california_data[california_data['Zip_Code'] == selected_zip]
-
-    if filtered_data.empty:
+    if selected_zip not in california_by_zip.index:
         return "No data available for the selected ZIP code."
 
-    zip_profile = filtered_data.iloc[0]
+    zip_profile = california_by_zip.loc[selected_zip]
 
     if 'Mailing City' not in zip_profile or pd.isna(zip_profile['Mailing City']):
         return "City data not available for the selected ZIP code."
 
     city_name = zip_profile['Mailing City']
-    city_population = california_data[california_data['Mailing City'] == city_name]['Population'].sum()
+    city_population = int(city_pop.get(city_name, 0))
 
 
     # retrieve city URL
-    city_image_row = city_images_df[city_images_df['City'].str.lower() == city_name.lower()]
-    image_url = city_image_row['Image_URL'].values[0] if not city_image_row.empty else None
+    image_url = city_image_urls.get(city_name.lower())
 
     portfolio_content = [
         html.H3(f"Profile for ZIP Code: {zip_profile['Zip_Code']}")
@@ -341,88 +566,19 @@ def update_slider(selected_feature):
      Input('feature-slider', 'value')]
 )
 def update_graph(selected_dimension, selected_feature, feature_range):
-    # Default axis titles and data for Generalized (combined t-SNE components)
-    xaxis_title, yaxis_title = 't-SNE Component 1', 't-SNE Component 2'
-    x_data, y_data = combined_coords[:, 0], combined_coords[:, 1]
-
-    # Update axis titles and data based on selected dimension
-    if selected_dimension == 'economic_prosperity':
-        xaxis_title = 'Median Income'
-        yaxis_title = 'Median Home Value'
-        x_data = census_data['Median_Income']
-        y_data = census_data['Median_Home_Value']
-    elif selected_dimension == 'educational_attainment':
-        xaxis_title = 'Percentage with Bachelor’s Degree'
-        yaxis_title = 'Percentage with Graduate/Professional Degree'
-        x_data = census_data['Bachelor_Degree']
-        y_data = census_data['Graduate_Professional_Degree']
-    elif selected_dimension == 'population_density':
-        xaxis_title = 'Population'
-        yaxis_title = 'Unemployment Rate'
-        x_data = census_data['Population']
-        y_data = census_data['Unemployment']
-    elif selected_dimension == 'ethnic_diversity':
-        xaxis_title = 'Percentage Hispanic or Latino'
-        yaxis_title = 'Percentage Black or African American'
-        x_data = census_data['Hispanic_Latino']
-        y_data = census_data['Black_Alone']
-
-    # Filter data based on selected feature and slider range
-    filtered_cbu_data = cbu_census_data[
-        (cbu_census_data[selected_feature] >= feature_range[0]) &
-        (cbu_census_data[selected_feature] <= feature_range[1])
-    ]
-    filtered_non_cbu_data = top_100_non_cbu_census_data[
-        (top_100_non_cbu_census_data[selected_feature] >= feature_range[0]) &
-        (top_100_non_cbu_census_data[selected_feature] <= feature_range[1])
-    ]
-
-    # Limit non-CBU nodes to 50
-    filtered_non_cbu_data = filtered_non_cbu_data.head(50)
-
-    # Generate hover info and update traces for filtered data
-    cbu_hover_info = generate_hover_info(filtered_cbu_data)
-    non_cbu_hover_info = generate_hover_info(filtered_non_cbu_data, closest_cbu_zipcodes, similarity_scores)
-
-    trace_cbu = go.Scatter(
-        x=x_data[:len(filtered_cbu_data)],
-        y=y_data[:len(filtered_cbu_data)],
-        mode='markers+text',
-        marker=dict(
-            size=10,
-            color='rgb(0, 213, 240)',
-            opacity=0.8
-        ),
-        text=filtered_cbu_data['Zip_Code'],
-        hoverinfo='text',
-        hovertext=cbu_hover_info,
-        name='CBU'
-    )
-
-    trace_non_cbu = go.Scatter(
-        x=x_data[len(filtered_cbu_data):len(filtered_cbu_data) + len(filtered_non_cbu_data)],
-        y=y_data[len(filtered_cbu_data):len(filtered_cbu_data) + len(filtered_non_cbu_data)],
-        mode='markers+text',
-        marker=dict(
-            size=10,
-            color='rgb(235,216,1)',
-            opacity=0.8
-        ),
-        text=filtered_non_cbu_data['Zip_Code'],
-        hoverinfo='text',
-        hovertext=non_cbu_hover_info,
-        name='Non-CBU'
-    )
-
-    layout = go.Layout(
-        xaxis=dict(title=xaxis_title),
-        yaxis=dict(title=yaxis_title),
-        margin=dict(l=0, r=0, b=0, t=0),
-        autosize=True,
-        showlegend=True
-    )
-
-    return go.Figure(data=[trace_cbu, trace_non_cbu], layout=layout)
+    # Quantize the slider range to the slider step so repeated interactions hit the figure cache
+    lo_bucket = round(feature_range[0] * SLIDER_SCALE)
+    hi_bucket = round(feature_range[1] * SLIDER_SCALE)
+    xaxis_title, yaxis_title, traces = _build_traces(selected_dimension, selected_feature, lo_bucket, hi_bucket)
+
+    # Only send the trace arrays and axis titles; the rest of the figure stays as rendered
+    patched_figure = Patch()
+    for i, trace_data in enumerate(traces):
+        for key, value in trace_data.items():
+            patched_figure['data'][i][key] = value
+    patched_figure['layout']['xaxis']['title']['text'] = xaxis_title
+    patched_figure['layout']['yaxis']['title']['text'] = yaxis_title
+    return patched_figure
 
 # Sidebar toggle callback
 @app.callback(
@@ -452,4 +608,5 @@ def toggle_sidebar(n_clicks, sidebar_style, graph_style):
 
 # Run Dash app
 if __name__ == '__main__':
-    app.run_server(debug=True)
+    # debug mode (dev server with reloader) is opt-in via DASH_DEBUG=1
+    app.run_server(debug=os.environ.get('DASH_DEBUG') == '1')
@@ -15,35 +15,19 @@
 
 
 
+import os
 import json
+import joblib
 import numpy as np
 import plotly.graph_objs as go
 from sklearn.manifold import TSNE
-from sklearn.metrics.pairwise import euclidean_distances
 from sklearn.preprocessing import StandardScaler
 import pandas as pd
-from dash import Dash, dcc, html
+from dash import Dash, dcc, html, Patch
 from dash.dependencies import Input, Output, State
 
 # Load data from the CSV file
 csv_file_path = 'census_zipcode_percentages.csv'
-full_census_data = pd.read_csv(csv_file_path)
-
-# Ensure Zip_Code is treated as a string and remove leading/trailing spaces
-full_census_data['Zip_Code'] = full_census_data['Zip_Code'].astype(str).str.strip()
-
-# Replace NULL (NaN) values with 0 or the median, depending on the column's type
-full_census_data.fillna({
-    'Population': 0,
-    'Median_Income': full_census_data['Median_Income'].median(),
-    'Bachelor_Degree': 0,
-    'Graduate_Professional_Degree': 0,
-    'White_Alone': 0,
-    'Black_Alone': 0,
-    'Hispanic_Latino': 0,
-    'Unemployment': full_census_data['Unemployment'].median(),
-    'Median_Home_Value': full_census_data['Median_Home_Value'].median()
-}, inplace=True)
 
 # List of CBU student zip codes
 cbu_zipcodes = [
@@ -56,52 +40,98 @@ cbu_zipcodes = [
     '91701', '92583'
 ]
 
-# Filter the census data for CBU zip codes
-cbu_census_data = full_census_data[full_census_data['Zip_Code'].isin(cbu_zipcodes)]
-
 # Relevant demographic features for clustering
 features = ['Population', 'Median_Income', 'Bachelor_Degree', 'Graduate_Professional_Degree',
             'White_Alone', 'Black_Alone', 'Hispanic_Latino', 'Unemployment', 'Median_Home_Value']
 
-# Standardize the data
-scaler = StandardScaler()
-cbu_census_data_scaled = scaler.fit_transform(cbu_census_data[features])
-
-# Find non-CBU zip codes
-non_cbu_census_data = full_census_data[~full_census_data['Zip_Code'].astype(str).isin(cbu_zipcodes)]
-non_cbu_census_data_scaled = scaler.transform(non_cbu_census_data[features])
-
-# Compute Euclidean distance between non-CBU zip codes and the centroid of the CBU zip codes
-cbu_centroid = np.mean(cbu_census_data_scaled, axis=0)
-distances = euclidean_distances(non_cbu_census_data_scaled, [cbu_centroid])
+# t-SNE dominates startup, so the preprocessed frames and embedding are cached on disk.
+# The CSV modification time is part of the cache key so the cache is invalidated when the data changes.
+memory = joblib.Memory('.cache', verbose=0)
 
-# Get indices of the 50 closest non-CBU zip codes based on demographic similarity
-top_50_indices = np.argsort(distances, axis=0)[:50].flatten()
 
-# Select the top 50 most similar non-CBU zip codes
-top_50_non_cbu_census_data = non_cbu_census_data.iloc[top_50_indices]
-top_50_non_cbu_census_data_scaled = non_cbu_census_data_scaled[top_50_indices]
+@memory.cache
+def _compute_embedding(csv_file_path, csv_mtime, cbu_zipcodes, features):
+    # Only read the columns in use; Zip_Code is parsed as a string and the features as float32
+    full_census_data = pd.read_csv(
+        csv_file_path,
+        usecols=['Zip_Code'] + features,
+        dtype={'Zip_Code': 'string', **{feature: 'float32' for feature in features}}
+    )
 
-# Perform t-SNE to reduce the data to 3D for both datasets
-tsne = TSNE(n_components=3, random_state=42, perplexity=5, init='random')
-combined_data_scaled = np.vstack([cbu_census_data_scaled, top_50_non_cbu_census_data_scaled])
-combined_coords = tsne.fit_transform(combined_data_scaled)
+    # Remove leading/trailing spaces from Zip_Code
+    full_census_data['Zip_Code'] = full_census_data['Zip_Code'].str.strip()
+
+    # Replace NULL (NaN) values with 0 or the median, depending on the column's type
+    full_census_data.fillna({
+        'Population': 0,
+        'Median_Income': full_census_data['Median_Income'].median(),
+        'Bachelor_Degree': 0,
+        'Graduate_Professional_Degree': 0,
+        'White_Alone': 0,
+        'Black_Alone': 0,
+        'Hispanic_Latino': 0,
+        'Unemployment': full_census_data['Unemployment'].median(),
+        'Median_Home_Value': full_census_data['Median_Home_Value'].median()
+    }, inplace=True)
+
+    # Filter the census data for CBU zip codes (one membership scan, reused negated for the non-CBU rows)
+    cbu_mask = full_census_data['Zip_Code'].isin(frozenset(cbu_zipcodes))
+    cbu_census_data = full_census_data[cbu_mask]
+
+    # Standardize the data in place on contiguous float32 matrices (half the memory traffic of float64)
+    scaler = StandardScaler(copy=False)
+    cbu_features = np.ascontiguousarray(cbu_census_data[features].to_numpy(dtype=np.float32, copy=True))
+    cbu_census_data_scaled = scaler.fit_transform(cbu_features)
+
+    # Find non-CBU zip codes
+    non_cbu_census_data = full_census_data[~cbu_mask]
+    non_cbu_features = np.ascontiguousarray(non_cbu_census_data[features].to_numpy(dtype=np.float32, copy=True))
+    non_cbu_census_data_scaled = scaler.transform(non_cbu_features)
+
+    # Compute Euclidean distance between non-CBU zip codes and the centroid of the CBU zip codes
+    # via ||x||^2 - 2x.c + ||c||^2: one matrix-vector product, no N x d difference array
+    # (squared distances keep the same order, so the sqrt is skipped)
+    cbu_centroid = np.mean(cbu_census_data_scaled, axis=0)
+    squared_norms = np.einsum('ij,ij->i', non_cbu_census_data_scaled, non_cbu_census_data_scaled)
+    squared_distances = squared_norms - 2.0 * (non_cbu_census_data_scaled @ cbu_centroid) + cbu_centroid @ cbu_centroid
+
+    # Get indices of the 50 closest non-CBU zip codes based on demographic similarity
+    # (partial select in O(N), then sort only those 50 by distance)
+    top_50_indices = np.argpartition(squared_distances, 50)[:50]
+    top_50_indices = top_50_indices[np.argsort(squared_distances[top_50_indices])]
+
+    # Select the top 50 most similar non-CBU zip codes
+    top_50_non_cbu_census_data = non_cbu_census_data.iloc[top_50_indices]
+    top_50_non_cbu_census_data_scaled = non_cbu_census_data_scaled[top_50_indices]
+
+    # Perform t-SNE to reduce the data to 3D for both datasets
+    # (Barnes-Hut with PCA init and auto learning rate)
+    tsne = TSNE(n_components=3, random_state=42, perplexity=5, learning_rate='auto', init='pca', n_jobs=-1)
+    combined_data_scaled = np.vstack([cbu_census_data_scaled, top_50_non_cbu_census_data_scaled])
+    combined_coords = tsne.fit_transform(combined_data_scaled)
+
+    return full_census_data, cbu_census_data, top_50_non_cbu_census_data, combined_coords
+
+
+full_census_data, cbu_census_data, top_50_non_cbu_census_data, combined_coords = _compute_embedding(
+    csv_file_path, os.path.getmtime(csv_file_path), cbu_zipcodes, features)
 
 # Extract CBU and top 50 non-CBU coordinates
 cbu_coords = combined_coords[:len(cbu_census_data)]
 non_cbu_coords = combined_coords[len(cbu_census_data):]
 
 def generate_hover_info(data):
-    hover_info = []
-    for i, row in data.iterrows():
-        hover_text = f"ZIP: {row['Zip_Code']}<br>" \
-                     f"Population: {int(row['Population'])}<br>" \
-                     f"Median Income: {int(row['Median_Income'])}<br>" \
-                     f"Education (Bachelors): {row['Bachelor_Degree']:.1f}<br>" \
-                     f"Unemployment: {row['Unemployment']:.1f}<br>" \
-                     f"Median Home Value: {int(row['Median_Home_Value'])}"
-        hover_info.append(hover_text)
-    return hover_info
+    if data.empty:
+        return []
+
+    # Format each column once and concatenate column-wise instead of iterating rows
+    hover_info = ("ZIP: " + data['Zip_Code'].astype(str)
+                  + "<br>Population: " + data['Population'].astype(int).astype(str)
+                  + "<br>Median Income: " + data['Median_Income'].astype(int).astype(str)
+                  + "<br>Education (Bachelors): " + data['Bachelor_Degree'].map('{:.1f}'.format)
+                  + "<br>Unemployment: " + data['Unemployment'].map('{:.1f}'.format)
+                  + "<br>Median Home Value: " + data['Median_Home_Value'].astype(int).astype(str))
+    return hover_info.tolist()
 
 cbu_hover_info = generate_hover_info(cbu_census_data)
 non_cbu_hover_info = generate_hover_info(top_50_non_cbu_census_data)
@@ -152,6 +182,54 @@ def create_3d_plot(cbu_coords, non_cbu_coords):
 
     return go.Figure(data=[trace_cbu, trace_non_cbu], layout=layout)
 
+# Features offered in the filter dropdown
+filter_features = ['Population', 'Median_Income', 'Bachelor_Degree', 'Unemployment', 'Median_Home_Value']
+
+# Min/max of each filterable column, taken once on the raw NumPy arrays
+_feature_bounds = {}
+for feature in filter_features:
+    column = full_census_data[feature].to_numpy()
+    _feature_bounds[feature] = (np.nanmin(column), np.nanmax(column))
+
+def _build_marks(selected_feature):
+    # Fields that are percentage-based
+    percentage_fields = ['Bachelor_Degree', 'Unemployment']
+
+    # Format values in thousands for these fields
+    fields_in_thousands = ['Population', 'Median_Income', 'Median_Home_Value']
+
+    if selected_feature in percentage_fields:
+        # Set range for percentage fields (0 to 1)
+        min_val, max_val = 0, 1
+        marks = {i / 10: f"{int(i * 10)}" for i in range(0, 11)}  # Marks from 0% to 100%
+    else:
+        # Use min and max values for non-percentage fields
+        min_val, max_val = _feature_bounds[selected_feature]
+
+        # Format marks for fields in thousands
+        if selected_feature in fields_in_thousands:
+            marks = {int(i): f"{int(i/1000)}" for i in np.linspace(min_val, max_val, num=10)}
+        else:
+            marks = {int(i): str(int(i)) for i in np.linspace(min_val, max_val, num=10)}
+
+    return min_val, max_val, marks
+
+# Slider range and marks for every filterable feature, built once instead of on each dropdown change
+_MARKS_CACHE = {feature: _build_marks(feature) for feature in filter_features}
+
+# Each filterable column sorted once as float32, so the callback counts a slider range with two binary searches
+def _presort(data):
+    return {feature: np.sort(data[feature].to_numpy(dtype=np.float32)) for feature in filter_features}
+
+def _count_in_range(sorted_columns, selected_feature, feature_range):
+    sorted_values = sorted_columns[selected_feature]
+    lo_i = np.searchsorted(sorted_values, feature_range[0], side='left')
+    hi_i = np.searchsorted(sorted_values, feature_range[1], side='right')
+    return max(int(hi_i - lo_i), 0)
+
+cbu_sorted_columns = _presort(cbu_census_data)
+top_50_non_cbu_sorted_columns = _presort(top_50_non_cbu_census_data)
+
 app = Dash(__name__)
 
 # App layout
@@ -247,27 +325,12 @@ def update_slider(selected_feature):
     # Fields that are percentage-based
     percentage_fields = ['Bachelor_Degree', 'Unemployment']
 
-    # Format values in thousands for these fields
-    fields_in_thousands = ['Population', 'Median_Income', 'Median_Home_Value']
+    min_val, max_val, marks = _MARKS_CACHE[selected_feature]
+    value = [min_val, max_val]
 
     if selected_feature in percentage_fields:
-        # Set range for percentage fields (0 to 1)
-        min_val, max_val = 0, 1
-        value = [min_val, max_val]
-        marks = {i / 10: f"{int(i * 10)}" for i in range(0, 11)}  # Marks from 0% to 100%
         label = f"{selected_feature.replace('_', ' ')} Percentage %:"
     else:
-        # Use min and max values for non-percentage fields
-        min_val = full_census_data[selected_feature].min()
-        max_val = full_census_data[selected_feature].max()
-        value = [min_val, max_val]
-
-        # Format marks for fields in thousands
-        if selected_feature in fields_in_thousands:
-            marks = {int(i): f"{int(i/1000)}" for i in np.linspace(min_val, max_val, num=10)}
-        else:
-            marks = {int(i): str(int(i)) for i in np.linspace(min_val, max_val, num=10)}
-
         label = f" {selected_feature.replace('_', ' ')} (in thousands):"
 
     return min_val, max_val, value, marks, label
@@ -307,34 +370,28 @@ def update_3d_graph(selected_dimension, selected_feature, feature_range):
         xaxis_title, yaxis_title, zaxis_title = 'Hispanic or Latino %', 'Black or African American %', 'Population'
 
 
-    # Apply feature-based filtering
-    filtered_cbu_data = cbu_census_data[
-        (cbu_census_data[selected_feature] >= feature_range[0]) &
-        (cbu_census_data[selected_feature] <= feature_range[1])
-    ]
-    filtered_non_cbu_data = top_50_non_cbu_census_data[
-        (top_50_non_cbu_census_data[selected_feature] >= feature_range[0]) &
-        (top_50_non_cbu_census_data[selected_feature] <= feature_range[1])
-    ]
+    # Apply feature-based filtering (only the number of rows in range is used below)
+    num_cbu = _count_in_range(cbu_sorted_columns, selected_feature, feature_range)
+    num_non_cbu = _count_in_range(top_50_non_cbu_sorted_columns, selected_feature, feature_range)
 
     # Generate updated coordinates
-    filtered_cbu_coords = np.column_stack((x_data[:len(filtered_cbu_data)],
-                                           y_data[:len(filtered_cbu_data)],
-                                           z_data[:len(filtered_cbu_data)]))
-    filtered_non_cbu_coords = np.column_stack((x_data[len(filtered_cbu_data):len(filtered_cbu_data) + len(filtered_non_cbu_data)],
-                                               y_data[len(filtered_cbu_data):len(filtered_cbu_data) + len(filtered_non_cbu_data)],
-                                               z_data[len(filtered_cbu_data):len(filtered_cbu_data) + len(filtered_non_cbu_data)]))
-
-        # Create the plot figure and update axis titles
-    figure = create_3d_plot(filtered_cbu_coords, filtered_non_cbu_coords)
-    figure.update_layout(
-        scene=dict(
-            xaxis_title=xaxis_title,
-            yaxis_title=yaxis_title,
-            zaxis_title=zaxis_title
-        )
-    )
-    return figure
+    filtered_cbu_coords = np.column_stack((x_data[:num_cbu],
+                                           y_data[:num_cbu],
+                                           z_data[:num_cbu]))
+    filtered_non_cbu_coords = np.column_stack((x_data[num_cbu:num_cbu + num_non_cbu],
+                                               y_data[num_cbu:num_cbu + num_non_cbu],
+                                               z_data[num_cbu:num_cbu + num_non_cbu]))
+
+    # Only send the marker positions and axis titles; the rest of the figure stays as rendered
+    patched_figure = Patch()
+    for i, coords in enumerate((filtered_cbu_coords, filtered_non_cbu_coords)):
+        patched_figure['data'][i]['x'] = coords[:, 0].tolist()
+        patched_figure['data'][i]['y'] = coords[:, 1].tolist()
+        patched_figure['data'][i]['z'] = coords[:, 2].tolist()
+    patched_figure['layout']['scene']['xaxis']['title']['text'] = xaxis_title
+    patched_figure['layout']['scene']['yaxis']['title']['text'] = yaxis_title
+    patched_figure['layout']['scene']['zaxis']['title']['text'] = zaxis_title
+    return patched_figure
 
 # Sidebar toggle callback
 @app.callback(
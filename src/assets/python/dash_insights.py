@@ -1,12 +1,23 @@
 from dash import Dash, dcc, html, Input, Output
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
 
-# Load datasets
-demographic_data = pd.read_csv('census_zipcode_percentages.csv')
-zip_occurrences_data = pd.read_csv('zipcode_occurrences.csv')
-enrollment_data = pd.read_csv('enrollment 2019-2023.csv')
+# Load datasets (only the columns in use; ZIP codes as strings)
+demographic_data = pd.read_csv(
+    'census_zipcode_percentages.csv',
+    usecols=['Zip_Code', 'Population', 'Median_Income', 'White_Alone', 'Black_Alone', 'Hispanic_Latino'],
+    dtype={'Zip_Code': 'string', 'Population': 'int32'}
+)
+zip_occurrences_data = pd.read_csv('zipcode_occurrences.csv', dtype={'Zip_Code': 'string', 'Count': 'int32'})
+# Pad any ZIP codes that lost their leading zeros so they still match the census ZIPs
+zip_occurrences_data['Zip_Code'] = zip_occurrences_data['Zip_Code'].str.zfill(5)
+enrollment_data = pd.read_csv(
+    'enrollment 2019-2023.csv',
+    usecols=['Mailing City', 'Mailing State/Province', 'Mailing Zip/Postal Code', 'Start Term and Year'],
+    dtype={'Mailing Zip/Postal Code': 'string'}
+)
 
 # Merge datasets to include occurrences in the demographic data
 merged_data = pd.merge(demographic_data, zip_occurrences_data, on="Zip_Code", how="inner")
@@ -20,11 +31,11 @@ app = Dash(__name__)
 
 def create_ethnicity_pie_chart(filtered_data):
     ethnicity_columns = ['White_Alone', 'Black_Alone', 'Hispanic_Latino']
-    for ethnicity in ethnicity_columns:
-        filtered_data[ethnicity] = filtered_data[ethnicity] * filtered_data['Population']
-    
-    ethnicity_data = filtered_data[[ethnicity for ethnicity in ethnicity_columns]].sum().reset_index()
-    ethnicity_data.columns = ['Ethnicity', 'Count']
+    # Weight each percentage by population in one broadcast multiply (leaves filtered_data untouched)
+    counts = filtered_data[ethnicity_columns].to_numpy() * filtered_data['Population'].to_numpy()[:, None]
+    totals = np.nansum(counts, axis=0)
+
+    ethnicity_data = pd.DataFrame({'Ethnicity': ethnicity_columns, 'Count': totals})
 
     pie_chart = px.pie(
         ethnicity_data, 
@@ -54,35 +65,51 @@ def update_pie_chart(top_percentage):
 ######## Enrollment Trends Chart ###########
 ############################################
 
-enrollment_data = enrollment_data[enrollment_data['Start Term and Year'].str.contains('Fall')]
-enrollment_data['Term_Year'] = enrollment_data['Start Term and Year']
-
-zip_trends = enrollment_data.groupby(['Mailing Zip/Postal Code', 'Term_Year']).size().reset_index(name='Count')
+enrollment_data = enrollment_data[enrollment_data['Start Term and Year'].str.contains('Fall', regex=False, na=False)]
+
+zip_trends = enrollment_data.groupby(['Mailing Zip/Postal Code', 'Start Term and Year']).size().reset_index(name='Count')
+
+def _topk_index(series, k, largest=True):
+    # Index labels of the k largest (or smallest) values in O(N) with a partial partition instead of a sort.
+    # Ties at the cut-off keep their first occurrences, matching Series.nlargest/nsmallest.
+    values = series.to_numpy()
+    if not largest:
+        values = -values
+    if len(values) <= k:
+        return series.index
+    kth_value = np.partition(values, len(values) - k)[len(values) - k]
+    above = np.flatnonzero(values > kth_value)
+    ties = np.flatnonzero(values == kth_value)[:k - len(above)]
+    return series.index[np.concatenate([above, ties])]
+
+# The trend filter only has three options, so the pivot/diff and the data behind each option are computed once
+_top_by_sum = zip_trends.groupby('Mailing Zip/Postal Code')['Count'].sum()
+_zip_diffsum = zip_trends.pivot(index='Start Term and Year', columns='Mailing Zip/Postal Code', values='Count').fillna(0).diff().sum()
+_trend_zip_codes = {
+    'top': _topk_index(_top_by_sum, 10),
+    'increasing': _topk_index(_zip_diffsum[_zip_diffsum > 0], 10),
+    'decreasing': _topk_index(_zip_diffsum[_zip_diffsum < 0], 10, largest=False),
+}
+_trend_data = {
+    trend_type: zip_trends[zip_trends['Mailing Zip/Postal Code'].isin(zip_codes)]
+    for trend_type, zip_codes in _trend_zip_codes.items()
+}
 
 @app.callback(
     Output('zip-trend-line-chart', 'figure'),
     Input('trend-filter', 'value')
 )
 def update_zip_trend_chart(trend_type):
-    if trend_type == 'top':
-        top_zip_codes = zip_trends.groupby('Mailing Zip/Postal Code')['Count'].sum().nlargest(10).index
-        data = zip_trends[zip_trends['Mailing Zip/Postal Code'].isin(top_zip_codes)]
-    elif trend_type == 'increasing':
-        zip_trend_changes = zip_trends.pivot(index='Term_Year', columns='Mailing Zip/Postal Code', values='Count').fillna(0).diff().sum()
-        increasing_zip_codes = zip_trend_changes[zip_trend_changes > 0].nlargest(10).index
-        data = zip_trends[zip_trends['Mailing Zip/Postal Code'].isin(increasing_zip_codes)]
-    else:
-        zip_trend_changes = zip_trends.pivot(index='Term_Year', columns='Mailing Zip/Postal Code', values='Count').fillna(0).diff().sum()
-        decreasing_zip_codes = zip_trend_changes[zip_trend_changes < 0].nsmallest(10).index
-        data = zip_trends[zip_trends['Mailing Zip/Postal Code'].isin(decreasing_zip_codes)]
+    # Any value other than 'top'/'increasing' shows the decreasing trends
+    data = _trend_data.get(trend_type, _trend_data['decreasing'])
 
     figure = px.line(
         data,
-        x='Term_Year',
+        x='Start Term and Year',
         y='Count',
         color='Mailing Zip/Postal Code',
         title='Enrollment Trends by ZIP Codes',
-        labels={'Term_Year': 'Year', 'Count': 'Student Count'}
+        labels={'Start Term and Year': 'Year', 'Count': 'Student Count'}
     )
     return figure
 
@@ -91,27 +118,34 @@ def update_zip_trend_chart(trend_type):
 ############################################
 ############################################
 
+# Student counts per (year, state, city), aggregated once; the callback only filters and sums these groups.
+# Missing years/states are kept so the unfiltered totals still include them.
+_city_counts = enrollment_data.groupby(
+    ['Start Term and Year', 'Mailing State/Province', 'Mailing City'], sort=False, dropna=False
+).size()
+
 @app.callback(
     Output('chord-diagram', 'figure'),
     [Input('year-dropdown', 'value'),
      Input('state-dropdown', 'value')]
 )
 def update_chord_diagram(selected_year, selected_state):
-    filtered_data = enrollment_data.copy()
+    counts = _city_counts
     if selected_year:
-        filtered_data = filtered_data[filtered_data['Start Term and Year'] == selected_year]
+        counts = counts[counts.index.get_level_values('Start Term and Year') == selected_year]
     if selected_state:
-        filtered_data = filtered_data[filtered_data['Mailing State/Province'] == selected_state]
+        counts = counts[counts.index.get_level_values('Mailing State/Province') == selected_state]
 
     # count students by city
-    student_counts = filtered_data.groupby('Mailing City')['Start Term and Year'].count().reset_index()
+    student_counts = counts.groupby(level='Mailing City').sum().reset_index()
     student_counts.columns = ['Mailing City', 'Count']
     target_region = 'CBU'
 
     # source and target nodes
     all_nodes = list(student_counts['Mailing City']) + [target_region]
-    source_indices = [all_nodes.index(city) for city in student_counts['Mailing City']]
-    target_indices = [all_nodes.index(target_region)] * len(source_indices)
+    node_idx = {name: i for i, name in enumerate(all_nodes)}
+    source_indices = [node_idx[city] for city in student_counts['Mailing City']]
+    target_indices = [node_idx[target_region]] * len(source_indices)
 
     figure = go.Figure(data=[go.Sankey(
         node=dict(
@@ -1,23 +1,39 @@
 from dash import Dash, dcc, html, Input, Output
 import pandas as pd
 
-# Load datasets
-demographic_data = pd.read_csv('census_zipcode_percentages.csv')
-enrollment_data = pd.read_csv('enrollment 2019-2023.csv')
+# Load datasets (only the columns in use; ZIP codes are read as strings so no re-casting is needed)
+demographic_data = pd.read_csv(
+    'census_zipcode_percentages.csv',
+    usecols=['Zip_Code', 'Population', 'Median_Income', 'Median_Age', 'Bachelor_Degree',
+             'Graduate_Professional_Degree', 'White_Alone', 'Black_Alone', 'Hispanic_Latino',
+             'Median_Home_Value', 'Median_Gross_Rent'],
+    dtype={'Zip_Code': 'string', 'Population': 'int32'}
+)
+enrollment_data = pd.read_csv(
+    'enrollment 2019-2023.csv',
+    usecols=['Mailing City', 'Mailing State/Province', 'Mailing Zip/Postal Code'],
+    dtype={'Mailing Zip/Postal Code': 'string'}
+)
 city_images_data = pd.read_csv('city_images.csv')  # Load city images CSV
 
-# Clean and prepare data
-enrollment_data['Mailing Zip/Postal Code'] = enrollment_data['Mailing Zip/Postal Code'].astype(str)
-demographic_data['Zip_Code'] = demographic_data['Zip_Code'].astype(str)
+# Store ZIP codes as categories sharing one set of categories, so the merge joins on int codes
+zip_dtype = pd.CategoricalDtype(demographic_data['Zip_Code'].unique())
+demographic_data['Zip_Code'] = demographic_data['Zip_Code'].astype(zip_dtype)
+enrollment_data['Mailing Zip/Postal Code'] = enrollment_data['Mailing Zip/Postal Code'].astype(zip_dtype)
+
+# Keep the first enrollment row per ZIP before merging, so the join never fans out per student
+enroll_zip = enrollment_data[['Mailing Zip/Postal Code', 'Mailing City', 'Mailing State/Province']].drop_duplicates(
+    subset=['Mailing Zip/Postal Code']
+)
 
 # Merge datasets to include states and cities
 merged_data = pd.merge(
     demographic_data,
-    enrollment_data[['Mailing Zip/Postal Code', 'Mailing City', 'Mailing State/Province']],
+    enroll_zip,
     left_on='Zip_Code',
     right_on='Mailing Zip/Postal Code',
     how='left'
-).drop_duplicates(subset=['Zip_Code'])
+)
 
 # Filter for California ZIP codes only
 california_data = merged_data[merged_data['Mailing State/Province'] == "CA"]
@@ -30,6 +46,12 @@ california_data = pd.merge(
     right_on='City',
     how='left'
 )
+# Cities as categories so the per-city grouping below works on int codes
+california_data['Mailing City'] = california_data['Mailing City'].astype('category')
+
+# Lookups for the profile callback: rows indexed by ZIP and population totals per city
+_by_zip = california_data.set_index('Zip_Code', drop=False)
+_city_pop_map = california_data.groupby('Mailing City', sort=False)['Population'].sum().to_dict()
 
 # Prepare ZIP code options for the dropdown
 zip_options = [{'label': zip_code, 'value': zip_code} for zip_code in california_data['Zip_Code'].unique()]
@@ -67,7 +89,10 @@ def update_zip_code_profile(selected_zip):
     if not selected_zip:
         return html.Div("None Selected", style={'color': 'red'})
     
-    filtered_data = california_data[california_data['Zip_Code'] == selected_zip]
+    if selected_zip in _by_zip.index:
+        filtered_data = _by_zip.loc[[selected_zip]]
+    else:
+        filtered_data = california_data.iloc[:0]
 
     # Debugging: Print filtered data
     print("Filtered Data:")
@@ -79,7 +104,7 @@ def update_zip_code_profile(selected_zip):
 
     # Calculate city population
     city_name = filtered_data.iloc[0]['Mailing City']
-    city_population = california_data[california_data['Mailing City'] == city_name]['Population'].sum()
+    city_population = _city_pop_map.get(city_name, 0)
     city_image_url = filtered_data.iloc[0]['Image_URL']  # Get city image URL
 
     # Create profile display for selected ZIP code